@@ -1,9 +1,8 @@
+import sys
 import json
 import plotly
 import pandas as pd
 
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
 from sklearn.model_selection import train_test_split
 from flask import Flask
 from flask import render_template, request, jsonify
@@ -12,18 +11,12 @@ import joblib
 from sqlalchemy import create_engine
 
 
-app = Flask(__name__)
-
-def tokenize(text):
-    tokens = word_tokenize(text)
-    lemmatizer = WordNetLemmatizer()
+# the pickled pipeline refers to the training helpers by name, so they must be importable here
+sys.path.append('../models')
+from train_classifier import tokenize, tokenize_corpus, identity_analyzer, MultiLabelXGBClassifier
 
-    clean_tokens = []
-    for tok in tokens:
-        clean_tok = lemmatizer.lemmatize(tok).lower().strip()
-        clean_tokens.append(clean_tok)
 
-    return clean_tokens
+app = Flask(__name__)
 
 # load data
 engine = create_engine('sqlite:///../data/DisasterResponse.db')
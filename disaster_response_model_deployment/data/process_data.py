@@ -1,4 +1,5 @@
 import sys
+import numpy as np
 import pandas as pd
 from sqlalchemy import create_engine
 
@@ -7,15 +8,20 @@ def load_data(messages_filepath, categories_filepath):
     Load data from two CSV files containing messages and categories, merge them on the 'id' column,
     and return a DataFrame.
 
+    Both files are parsed with the multithreaded pyarrow engine and kept Arrow-backed,
+    so the string operations in clean_data run on Arrow's vectorized kernels.
+
     Parameters:
     messages_filepath (str): The file path to the CSV file containing messages.
     categories_filepath (str): The file path to the CSV file containing categories.
 
     Returns:
-    pandas.DataFrame: Merged DataFrame containing messages and their corresponding categories.
+    pandas.DataFrame: Merged (Arrow-backed) DataFrame containing messages and their corresponding categories.
     """
-    messages =  pd.read_csv(messages_filepath)
-    categories = pd.read_csv(categories_filepath)
+    messages = pd.read_csv(messages_filepath, engine='pyarrow',
+                           dtype_backend='pyarrow', dtype={'id': 'int32'})
+    categories = pd.read_csv(categories_filepath, engine='pyarrow',
+                             dtype_backend='pyarrow', dtype={'id': 'int32'})
     df = pd.merge(messages, categories, on = 'id')
     return df
 
@@ -30,9 +36,9 @@ def clean_data(df):
     pandas.DataFrame: The cleaned DataFrame with separate category columns and binary category values.
 
     Steps:
-    1. Split the 'categories' column into separate category columns.
-    2. Extract category column names and apply them to the new DataFrame.
-    3. Convert category values to binary (0 or 1).
+    1. Collect the distinct 'categories' strings.
+    2. Extract category column names.
+    3. Convert category values to binary (0 or 1) and expand them back to one row per message.
     4. Drop the original 'categories' column.
     5. Combine the cleaned DataFrame with the new category columns.
     6. Drop the 'child_alone' column as it contains only zeros.
@@ -40,17 +46,37 @@ def clean_data(df):
     8. Drop duplicate rows.
     """
     #Step 1
-    categories = df['categories'].str.split(pat=';',expand=True)
+    # many messages share the same categories string, so only the distinct strings are parsed
+    codes, unique_categories = pd.factorize(df['categories'])
+    if (codes < 0).any():
+        raise ValueError("{} messages have no categories".format((codes < 0).sum()))
+    unique_categories = list(unique_categories)
 
     #Step 2
-    row = categories.iloc[0]
-    category_colnames = row.apply(lambda s:s[:-2])
-    categories.columns = category_colnames
+    category_colnames = [s[:-2] for s in unique_categories[0].split(';')]
 
     #Step 3
-    for column in categories:
-        categories[column] = categories[column].apply(lambda s:s[-1])
-        categories[column] = categories[column].astype(int)
+    width = len(unique_categories[0])
+    if all(len(s) == width and s.isascii() for s in unique_categories):
+        # with single-digit values every string has the same layout, so the digits are read at
+        # fixed offsets of a (n_unique, width) byte matrix instead of splitting each string
+        buf = np.frombuffer(''.join(unique_categories).encode('ascii'), dtype=np.uint8).reshape(-1, width)
+        offsets = [i - 1 for i, c in enumerate(unique_categories[0]) if c == ';'] + [width - 1]
+        layout = np.ones(width, dtype=bool)
+        layout[offsets] = False
+        if not (buf[:, layout] == buf[0, layout]).all():
+            raise ValueError("every categories string must list the categories in the same order")
+        digits = buf[:, offsets] - ord('0')
+        if not (digits <= 9).all():
+            raise ValueError("category values must be single digits")
+        values = digits.astype(np.int8)
+    else:
+        categories = pd.Series(unique_categories).str.split(pat=';',expand=True)
+        # rows with a different number of categories would be padded with None, which stack() drops
+        if categories.shape[1] != len(category_colnames) or categories.isna().any(axis=None):
+            raise ValueError("every categories string must list {} categories".format(len(category_colnames)))
+        values = categories.stack().str[-1].astype(np.int8).unstack().to_numpy()
+    categories = pd.DataFrame(values[codes], columns=category_colnames, index=df.index)
 
     #Step 4
     df = df.drop(['categories'],axis = 1)
@@ -62,7 +88,7 @@ def clean_data(df):
     df = df.drop('child_alone',axis = 1)
     
     #Step 7
-    df['related'] = df['related'].apply(lambda x: 1 if x==2 else x) 
+    df['related'] = df['related'].replace(2, 1)
 
     #Step 8
     df = df.drop_duplicates()
@@ -82,10 +108,14 @@ def save_data(df, database_filepath):
 
     Steps:
     1. Create a SQLAlchemy Engine object with the specified database filepath.
-    2. Save the DataFrame to the specified database with the table name 'DisasterResponse'.
+    2. Turn off SQLite's rollback journal and fsyncs for this connection; the file is rebuilt from the CSVs anyway.
+    3. Save the DataFrame to the specified database with the table name 'DisasterResponse' in a single transaction.
     """
     engine = create_engine('sqlite:///'+database_filepath)
-    df.to_sql('DisasterResponse', engine, index=False, if_exists='replace')
+    with engine.begin() as conn:
+        conn.exec_driver_sql('PRAGMA journal_mode=OFF')
+        conn.exec_driver_sql('PRAGMA synchronous=OFF')
+        df.to_sql('DisasterResponse', conn, index=False, if_exists='replace')
 
 
 def main():